@@ -1,7 +1,11 @@
-import json
+import hashlib
 import os
-from typing import Dict, Any, List, Tuple
+import zlib
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Iterable, Iterator
 
+import numpy as np
+import orjson
 from flask import Flask, render_template, request, jsonify, session, Response
 
 
@@ -59,6 +63,44 @@ LABEL_MAP: Dict[str, str] = {
 # Drop original source score fields from output (still used internally)
 SOURCE_SCORE_FIELDS_TO_DROP = set(FIELD_MAP.values())
 
+# FIELD_MAP source keys in CRITERIA order; resolved once instead of
+# FIELD_MAP.get(crit, crit) per feature
+SOURCE_KEYS = tuple(FIELD_MAP.get(c, c) for c in CRITERIA)
+
+# Static part of the slider metadata rendered by "/"; only the current
+# weight value varies per request
+_CRITERIA_META_STATIC = tuple({"key": k, "label": LABEL_MAP.get(k, k)} for k in CRITERIA)
+
+# Precomputed per-criterion output keys (ordered like CRITERIA) so the hot
+# loops never pay for f-string construction.
+_INPUT_KEYS = tuple(f"{c}_input" for c in CRITERIA)
+_WEIGHT_KEYS = tuple(f"{c}_weight" for c in CRITERIA)
+_SCORE_KEYS = tuple(f"{c}_score" for c in CRITERIA)
+_NORM_COMP_KEYS = tuple(f"{c}_norm_score_composition" for c in CRITERIA)
+_NET_MAX_KEYS = tuple(f"{c}_network_max_score" for c in CRITERIA)
+_NORM_NET_KEYS = tuple(f"{c}_norm_score_network" for c in CRITERIA)
+_SCORE_DIFF_KEYS = tuple(f"{c}_score_diff" for c in CRITERIA)
+_NORM_NET_DIFF_KEYS = tuple(f"{c}_norm_score_network_diff" for c in CRITERIA)
+_NORM_COMP_DIFF_KEYS = tuple(f"{c}_norm_score_composition_diff" for c in CRITERIA)
+
+
+# Parsed base network cache:
+#   path -> (stat signature, FeatureCollection, input matrix, cleaned static
+#            props, pre-encoded geometry JSON bytes).
+# The source GeoJSON is static at runtime, so reparsing it per request is waste.
+_BASE_CACHE: Dict[
+    str, Tuple[Tuple[int, int], Dict[str, Any], np.ndarray, List[Dict[str, Any]], List[bytes]]
+] = {}
+
+
+def _stat_signature(path: str) -> Tuple[int, int]:
+    """(st_mtime_ns, st_size) of the file; (-1, -1) when it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (-1, -1)
+    return (st.st_mtime_ns, st.st_size)
+
 
 # -----------------------------------------------------------------------------
 # HELPERS
@@ -70,8 +112,47 @@ def _load_geojson(path: str) -> Dict[str, Any]:
             f"Expected at static/application/data/WestValleyATPNetwork.geojson.\n"
             f"Either create it or set BASE_GEOJSON_PATH."
         )
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # orjson's C parser is several times faster than stdlib json on this
+    # numeric-heavy file; with the mtime cache it runs once per process
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _load_base_network(
+    path: str,
+) -> Tuple[Dict[str, Any], np.ndarray, List[Dict[str, Any]], List[bytes]]:
+    """
+    Return (FeatureCollection, input matrix, cleaned static props, geometry
+    blobs) for the base network, cached in process memory and invalidated
+    when the file mtime changes.
+
+    Static props are each feature's passthrough properties with the
+    original source *_Score fields already dropped, so per-request output
+    assembly is a single dict merge instead of copy + pop.
+
+    Geometry blobs are each feature's geometry pre-encoded as JSON bytes:
+    geometries never change with weights, so encoding their coordinate
+    arrays is per-process work, not per-request work.
+    """
+    sig = _stat_signature(path)
+    cached = _BASE_CACHE.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1], cached[2], cached[3], cached[4]
+
+    base_fc = _load_geojson(path)
+    feats = base_fc.get("features", []) or []
+    inputs = _input_matrix(feats)
+    static_props = [
+        {
+            k: v
+            for k, v in (feat.get("properties") or {}).items()
+            if k not in SOURCE_SCORE_FIELDS_TO_DROP
+        }
+        for feat in feats
+    ]
+    geom_blobs = [orjson.dumps(feat.get("geometry")) for feat in feats]
+    _BASE_CACHE[path] = (sig, base_fc, inputs, static_props, geom_blobs)
+    return base_fc, inputs, static_props, geom_blobs
 
 
 def _safe_float(v: Any, default: float = 0.0) -> float:
@@ -84,146 +165,145 @@ def _safe_float(v: Any, default: float = 0.0) -> float:
 def _parse_weights(form: Dict[str, Any]) -> Dict[str, float]:
     """Parse POSTed slider weights; expected 0–10 (step 0.5)."""
     prior = session.get("weights", DEFAULT_WEIGHTS)
-    weights: Dict[str, float] = {}
 
+    values = []
     for k in CRITERIA:
-        if k in form:
-            weights[k] = _safe_float(form.get(k), default=prior.get(k, DEFAULT_WEIGHTS[k]))
-        else:
-            weights[k] = _safe_float(prior.get(k, DEFAULT_WEIGHTS[k]), default=DEFAULT_WEIGHTS[k])
+        fallback = _safe_float(prior.get(k, DEFAULT_WEIGHTS[k]), default=DEFAULT_WEIGHTS[k])
+        values.append(_safe_float(form.get(k), default=fallback) if k in form else fallback)
+
+    # nan_to_num first: clip propagates NaN, which would poison the session
+    # weights and every downstream score/cache key
+    clamped = np.clip(np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0), 0.0, 10.0)
+    return dict(zip(CRITERIA, clamped.tolist()))
+
+
+def _normalize(values: Any, out_min: float, out_max: float) -> np.ndarray:
+    """Min-max normalize to [out_min, out_max] (vectorized)."""
+    a = np.asarray(values, dtype=np.float64)
+    if a.size == 0:
+        return a
+    vmin = a.min()
+    rng = float(np.ptp(a))
+    if rng == 0.0:
+        # flat input: midpoint-style fill, selected once outside the array op
+        fill = 0.0 if out_min < 0 < out_max else out_min
+        return np.full_like(a, fill)
+    return out_min + (a - vmin) * ((out_max - out_min) / rng)
+
+
+def _scale_0_1(values: Any) -> np.ndarray:
+    """Min-max scale to [0,1] (vectorized). Flat input -> 0.0."""
+    a = np.asarray(values, dtype=np.float64)
+    if a.size == 0:
+        return a
+    vmin = a.min()
+    rng = float(np.ptp(a))
+    if rng == 0.0:
+        return np.zeros_like(a)
+    return (a - vmin) / rng
+
+
+def _input_matrix(feats: List[Dict[str, Any]]) -> np.ndarray:
+    """(N, len(CRITERIA)) float32 matrix of raw criterion inputs (SoA layout)."""
+    n = len(feats)
+    it = (
+        _safe_float((feat.get("properties") or {}).get(src, 0.0))
+        for feat in feats
+        for src in SOURCE_KEYS
+    )
+    return np.fromiter(it, dtype=np.float32, count=n * len(SOURCE_KEYS)).reshape(n, len(SOURCE_KEYS))
 
-        weights[k] = max(0.0, min(10.0, weights[k]))
 
-    return weights
+def _weights_key(weights: Dict[str, float]) -> Tuple[float, ...]:
+    """Hashable cache key for a weights dict, ordered like CRITERIA."""
+    return tuple(_safe_float(weights.get(c, 0.0)) for c in CRITERIA)
 
 
-def _normalize(values: List[float], out_min: float, out_max: float) -> List[float]:
-    """Min-max normalize to [out_min, out_max]."""
-    if not values:
-        return []
-    vmin, vmax = min(values), max(values)
-    if vmax == vmin:
-        if out_min < 0 < out_max:
-            return [0.0 for _ in values]
-        return [out_min for _ in values]
-    scale = (out_max - out_min) / (vmax - vmin)
-    return [out_min + (v - vmin) * scale for v in values]
+@lru_cache(maxsize=64)
+def _weight_vector_for_key(key: Tuple[float, ...]) -> np.ndarray:
+    """Memoized float32 array for a weights key; sliders revisit few states."""
+    return np.asarray(key, dtype=np.float32)
 
 
-def _scale_0_1(values: List[float]) -> List[float]:
-    """Min-max scale to [0,1]. Flat list -> 0.0."""
-    if not values:
-        return []
-    vmin, vmax = min(values), max(values)
-    if vmax == vmin:
-        return [0.0 for _ in values]
-    return [(v - vmin) / (vmax - vmin) for v in values]
+def _weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    """(len(CRITERIA),) float32 weight vector, ordered like CRITERIA."""
+    return _weight_vector_for_key(_weights_key(weights))
 
 
-def _compute_per_feature_fields(props: Dict[str, Any], weights: Dict[str, float]) -> Tuple[Dict[str, Any], float]:
+def _compute_scores_soa(
+    inputs: np.ndarray, weights: Dict[str, float]
+) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Per-feature calculations.
+    Vectorized per-feature calculations over the whole network at once.
 
-    Per criterion outputs:
-      - <crit>_input
-      - <crit>_weight
-      - <crit>_score                  = input × weight
-      - <crit>_norm_score_composition = (input×weight) / sum(weights)
+    Per criterion (per feature):
+      - score                  = input × weight
+      - norm_score_composition = (input×weight) / sum(weights)
+      - network_max_score      = max(score) across all segments
+      - norm_score_network     = score / network_max_score
 
     Returns:
-      - fields dict (no network max yet)
+      - (K,) weight vector
       - weight_sum
+      - (N, K) scores matrix
+      - (N, K) composition-normalized scores matrix
+      - (N, K) network-normalized scores matrix
+      - (K,) network max vector
     """
-    fields: Dict[str, Any] = {}
-    weight_sum = 0.0
-
-    for crit in CRITERIA:
-        prop_key = FIELD_MAP.get(crit, crit)
-        x = _safe_float(props.get(prop_key, 0.0), default=0.0)
-        w = _safe_float(weights.get(crit, 0.0), default=0.0)
+    w = _weight_vector(weights)
+    weight_sum = float(w.sum())
 
-        score = x * w
-
-        fields[f"{crit}_input"] = x
-        fields[f"{crit}_weight"] = w
-        fields[f"{crit}_score"] = score
-
-        weight_sum += w
-
-    # composition normalization (within segment): score / sum(weights)
+    scores = inputs * w
     if weight_sum > 0:
-        for crit in CRITERIA:
-            fields[f"{crit}_norm_score_composition"] = fields[f"{crit}_score"] / weight_sum
+        norm_comp = scores / weight_sum
     else:
-        for crit in CRITERIA:
-            fields[f"{crit}_norm_score_composition"] = 0.0
-
-    return fields, weight_sum
+        norm_comp = np.zeros_like(scores)
 
+    # network normalization: one reduction + one broadcast divide (zero-guarded)
+    network_max = scores.max(axis=0) if scores.size else np.zeros(len(CRITERIA), dtype=np.float32)
+    safe_max = np.where(network_max > 0, network_max, 1.0)
+    norm_net = np.where(network_max > 0, scores / safe_max, 0.0)
 
-def _add_network_max_and_norm(fields_list: List[Dict[str, Any]]) -> Dict[str, float]:
-    """
-    Adds to each fields dict:
-      - <crit>_network_max_score  = max(score) across all segments
-      - <crit>_norm_score_network = score / network_max_score
-    """
-    network_max_by_crit: Dict[str, float] = {crit: 0.0 for crit in CRITERIA}
-
-    for fields in fields_list:
-        for crit in CRITERIA:
-            v = _safe_float(fields.get(f"{crit}_score", 0.0), default=0.0)
-            if v > network_max_by_crit[crit]:
-                network_max_by_crit[crit] = v
+    return w, weight_sum, scores, norm_comp, norm_net, network_max
 
-    for fields in fields_list:
-        for crit in CRITERIA:
-            max_v = network_max_by_crit.get(crit, 0.0)
-            fields[f"{crit}_network_max_score"] = max_v
-            score_v = _safe_float(fields.get(f"{crit}_score", 0.0), default=0.0)
-            fields[f"{crit}_norm_score_network"] = (score_v / max_v) if max_v > 0 else 0.0
-
-    return network_max_by_crit
 
+@lru_cache(maxsize=16)
+def _scores_for_key(
+    w_key: Tuple[float, ...], stat_sig: Tuple[int, int]
+) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Memoized _compute_scores_soa results per weight state.
 
-def _priority_score(fields: Dict[str, Any]) -> float:
-    """NEW Priority Score: sum of raw per-criterion score (input × weight)."""
-    return sum(_safe_float(fields.get(f"{crit}_score", 0.0)) for crit in CRITERIA)
+    A typical request pairs the new weights with the previous request's
+    weights, so the baseline pass is usually a cache hit. stat_sig keys the
+    entry to the base file; callers must treat the returned arrays as
+    read-only.
+    """
+    _, inputs, _, _ = _load_base_network(BASE_GEOJSON_PATH)
+    return _compute_scores_soa(inputs, dict(zip(CRITERIA, w_key)))
 
 
-def _priority_composition_sum(fields: Dict[str, Any]) -> float:
-    """
-    Sum of composition contributions.
-    Equals: sum(score_i / sum(weights)) = (sum(score_i)) / sum(weights)
-    """
-    return sum(_safe_float(fields.get(f"{crit}_norm_score_composition", 0.0)) for crit in CRITERIA)
+def _scores_for_weights(
+    weights: Dict[str, float],
+) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return _scores_for_key(_weights_key(weights), _stat_signature(BASE_GEOJSON_PATH))
 
 
-def _criterion_diffs(current_fields: Dict[str, Any], prev_fields: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Per-criterion diffs (current - prev) for export/download.
-      - <crit>_score_diff
-      - <crit>_norm_score_network_diff
-      - <crit>_norm_score_composition_diff
-    """
-    out: Dict[str, Any] = {}
-    for crit in CRITERIA:
-        out[f"{crit}_score_diff"] = _safe_float(current_fields.get(f"{crit}_score", 0.0)) - _safe_float(
-            prev_fields.get(f"{crit}_score", 0.0)
-        )
-        out[f"{crit}_norm_score_network_diff"] = _safe_float(
-            current_fields.get(f"{crit}_norm_score_network", 0.0)
-        ) - _safe_float(prev_fields.get(f"{crit}_norm_score_network", 0.0))
-        out[f"{crit}_norm_score_composition_diff"] = _safe_float(
-            current_fields.get(f"{crit}_norm_score_composition", 0.0)
-        ) - _safe_float(prev_fields.get(f"{crit}_norm_score_composition", 0.0))
-    return out
+def _gzip_stream(chunks: Iterable[bytes], level: int = 1) -> Iterator[bytes]:
+    """Gzip-compress a byte-chunk stream on the fly (level 1: cheap CPU,
+    still a large reduction on repetitive float text)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
 
 
-def _drop_source_scores(props: Dict[str, Any]) -> None:
-    """Remove original source *_Score fields from outgoing properties (in-place)."""
-    for k in list(props.keys()):
-        if k in SOURCE_SCORE_FIELDS_TO_DROP:
-            props.pop(k, None)
+# Constant all-zero diffs, reused when current and previous weights are equal.
+_ZERO_DIFFS: Dict[str, float] = dict.fromkeys(
+    _SCORE_DIFF_KEYS + _NORM_NET_DIFF_KEYS + _NORM_COMP_DIFF_KEYS, 0.0
+)
 
 
 # -----------------------------------------------------------------------------
@@ -233,15 +313,9 @@ def _drop_source_scores(props: Dict[str, Any]) -> None:
 def index():
     weights = session.get("weights", DEFAULT_WEIGHTS)
 
-    criteria_meta = []
-    for k in CRITERIA:
-        criteria_meta.append(
-            {
-                "key": k,
-                "label": LABEL_MAP.get(k, k),
-                "value": weights.get(k, DEFAULT_WEIGHTS[k]),
-            }
-        )
+    criteria_meta = [
+        {**m, "value": weights.get(m["key"], DEFAULT_WEIGHTS[m["key"]])} for m in _CRITERIA_META_STATIC
+    ]
 
     return render_template(
         "index.html",
@@ -267,81 +341,63 @@ def revise_weights():
     return jsonify(ok=True, weights=weights, prev_weights=session.get("prev_weights"))
 
 
-@app.route("/api/network_geojson.geojson", methods=["GET"])
-def network_geojson():
-    """
-    Returns dynamically reweighted FeatureCollection.
-
-    Key outputs:
-      - Priority_Score = sum(score_i) where score_i = input_i × weight_i
-      - Priority_Score_Scaled = min-max scale Priority_Score to [0,1]
-      - Priority_Score_Composition = sum(score_i / sum(weights)) (weighted-average-like)
-
-      - Difference_Raw = current Priority_Score - previous Priority_Score
-      - Difference_Score = min-max normalize Difference_Raw to [-1,1] for map coloring
-
-    Keeps per-criterion diagnostic fields:
-      - <crit>_network_max_score
-      - <crit>_norm_score_network
-      - <crit>_norm_score_composition
-
-    Drops original source *_Score fields from output.
-    """
-    weights = session.get("weights", DEFAULT_WEIGHTS)
-    prev_weights = session.get("prev_weights", weights)  # first load => no difference
-
-    base_fc = _load_geojson(BASE_GEOJSON_PATH)
+def _network_geojson_chunks(weights: Dict[str, float], prev_weights: Dict[str, float]) -> Iterator[bytes]:
+    """Compute the reweighted FeatureCollection and yield it as JSON byte chunks."""
+    base_fc, inputs, static_props, geom_blobs = _load_base_network(BASE_GEOJSON_PATH)
     feats = base_fc.get("features", []) or []
 
-    # ---- current fields ----
-    current_fields_list: List[Dict[str, Any]] = []
-    current_weight_sums: List[float] = []
+    same_weights = prev_weights == weights
 
-    for feat in feats:
-        props = feat.get("properties") or {}
-        fields, weight_sum = _compute_per_feature_fields(props, weights)
-        current_fields_list.append(fields)
-        current_weight_sums.append(weight_sum)
-
-    _add_network_max_and_norm(current_fields_list)
+    # ---- current + previous fields (fused: both share the same inputs load) ----
+    w_cur, current_weight_sum, scores_cur, norm_comp_cur, norm_net_cur, network_max = _scores_for_weights(
+        weights
+    )
 
-    current_priority = [_priority_score(f) for f in current_fields_list]
-    current_priority_comp = [_priority_composition_sum(f) for f in current_fields_list]
+    current_priority = scores_cur.sum(axis=1)
+    current_priority_comp = norm_comp_cur.sum(axis=1)
     current_priority_scaled = _scale_0_1(current_priority)
 
-    # ---- previous (last-run) fields ----
-    prev_fields_list: List[Dict[str, Any]] = []
-    for feat in feats:
-        props = feat.get("properties") or {}
-        fields, _ = _compute_per_feature_fields(props, prev_weights)
-        prev_fields_list.append(fields)
+    if same_weights:
+        # first load (or unchanged weights): every diff is exactly zero,
+        # so skip the entire previous pass
+        diff_raw = diff_score = np.zeros(len(feats), dtype=np.float32)
+        diff_comp_raw = diff_comp_score = diff_raw
+        score_diff = norm_net_diff = norm_comp_diff = None
+    else:
+        _, _, scores_prev, norm_comp_prev, norm_net_prev, _ = _scores_for_weights(prev_weights)
 
-    _add_network_max_and_norm(prev_fields_list)
+        prev_priority = scores_prev.sum(axis=1)
+        prev_priority_comp = norm_comp_prev.sum(axis=1)
 
-    prev_priority = [_priority_score(f) for f in prev_fields_list]
-    prev_priority_comp = [_priority_composition_sum(f) for f in prev_fields_list]
+        # ---- differences (based on Priority_Score) ----
+        diff_raw = current_priority - prev_priority
+        diff_score = _normalize(diff_raw, -1.0, 1.0)
 
-    # ---- differences (based on Priority_Score) ----
-    diff_raw = [c - p for c, p in zip(current_priority, prev_priority)]
-    diff_score = _normalize(diff_raw, -1.0, 1.0) if diff_raw else []
+        diff_comp_raw = current_priority_comp - prev_priority_comp
+        diff_comp_score = _normalize(diff_comp_raw, -1.0, 1.0)
 
-    diff_comp_raw = [c - p for c, p in zip(current_priority_comp, prev_priority_comp)]
-    diff_comp_score = _normalize(diff_comp_raw, -1.0, 1.0) if diff_comp_raw else []
+        # per-criterion diffs: three (N, K) subtractions instead of N dict walks
+        score_diff = np.round(scores_cur - scores_prev, 3)
+        norm_net_diff = np.round(norm_net_cur - norm_net_prev, 3)
+        norm_comp_diff = np.round(norm_comp_cur - norm_comp_prev, 3)
 
-    out_fc = {
-        "type": "FeatureCollection",
-        "name": base_fc.get("name", "network"),
-        "crs": base_fc.get("crs"),
-        "features": [],
-    }
-
-    for i, feat in enumerate(feats):
-        props = (feat.get("properties") or {}).copy()
+    # quantize dynamic outputs to 3 decimals before emit: the scores are
+    # UI-grade, and the shorter float strings cut the wire size
+    scores_cur, norm_comp_cur, norm_net_cur, network_max = (
+        np.round(a, 3) for a in (scores_cur, norm_comp_cur, norm_net_cur, network_max)
+    )
+    current_priority, current_priority_comp, current_priority_scaled = (
+        np.round(a, 3) for a in (current_priority, current_priority_comp, current_priority_scaled)
+    )
+    diff_raw, diff_score, diff_comp_raw, diff_comp_score = (
+        np.round(a, 3) for a in (diff_raw, diff_score, diff_comp_raw, diff_comp_score)
+    )
 
-        # drop original source score fields
-        _drop_source_scores(props)
+    def _build_props(i: int) -> Dict[str, Any]:
+        # static passthrough props are precleaned at cache time; merge, don't copy+pop
+        props = dict(static_props[i])
 
-        props["Weight_Sum"] = current_weight_sums[i] if i < len(current_weight_sums) else 0.0
+        props["Weight_Sum"] = current_weight_sum
 
         # NEW primary priority fields
         props["Priority_Score"] = current_priority[i] if i < len(current_priority) else 0.0
@@ -358,23 +414,117 @@ def network_geojson():
         props["Difference_Composition_Raw"] = diff_comp_raw[i] if i < len(diff_comp_raw) else 0.0
         props["Difference_Composition_Score"] = diff_comp_score[i] if i < len(diff_comp_score) else 0.0
 
-        # per-criterion computed fields (current)
-        props.update(current_fields_list[i])
+        # per-criterion computed fields (current), straight from the arrays
+        for j in range(len(CRITERIA)):
+            props[_INPUT_KEYS[j]] = inputs[i, j]
+            props[_WEIGHT_KEYS[j]] = w_cur[j]
+            props[_SCORE_KEYS[j]] = scores_cur[i, j]
+            props[_NORM_COMP_KEYS[j]] = norm_comp_cur[i, j]
+            props[_NET_MAX_KEYS[j]] = network_max[j]
+            props[_NORM_NET_KEYS[j]] = norm_net_cur[i, j]
 
         # per-criterion diffs for export/download
-        props.update(_criterion_diffs(current_fields_list[i], prev_fields_list[i]))
-
-        out_fc["features"].append(
-            {
-                "type": "Feature",
-                "geometry": feat.get("geometry"),
-                "properties": props,
-            }
+        if same_weights:
+            props.update(_ZERO_DIFFS)
+        else:
+            for j in range(len(CRITERIA)):
+                props[_SCORE_DIFF_KEYS[j]] = score_diff[i, j]
+                props[_NORM_NET_DIFF_KEYS[j]] = norm_net_diff[i, j]
+                props[_NORM_COMP_DIFF_KEYS[j]] = norm_comp_diff[i, j]
+
+        return props
+
+    header = {
+        "type": "FeatureCollection",
+        "name": base_fc.get("name", "network"),
+        "crs": base_fc.get("crs"),
+    }
+
+    # stream feature-by-feature: constant memory, C-level encoding;
+    # geometry bytes are pre-encoded at cache time and spliced in as-is
+    yield orjson.dumps(header)[:-1] + b',"features":['
+    for i in range(len(feats)):
+        yield (
+            (b"," if i else b"")
+            + b'{"type":"Feature","geometry":'
+            + geom_blobs[i]
+            + b',"properties":'
+            + orjson.dumps(_build_props(i), option=orjson.OPT_SERIALIZE_NUMPY)
+            + b"}"
         )
+    yield b"]}"
+
+
+@lru_cache(maxsize=32)
+def _network_body_gzipped(
+    w_key: Tuple[float, ...], pw_key: Tuple[float, ...], stat_sig: Tuple[int, int]
+) -> bytes:
+    """
+    Memoized, gzipped response body for one (weights, prev_weights) state.
+
+    The endpoint is deterministic in the weight vectors and the base file,
+    so identical slider states (page refresh, second browser, back button)
+    can reuse prebuilt bytes. The file stat signature is part of the key
+    purely to invalidate on base-file changes; the slider step of 0.5
+    keeps the key space small.
+    """
+    weights = dict(zip(CRITERIA, w_key))
+    prev_weights = dict(zip(CRITERIA, pw_key))
+    return b"".join(_gzip_stream(_network_geojson_chunks(weights, prev_weights)))
 
-    resp = Response(json.dumps(out_fc), mimetype="application/json")
-    resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    resp.headers["Pragma"] = "no-cache"
+
+@app.route("/api/network_geojson.geojson", methods=["GET"])
+def network_geojson():
+    """
+    Returns dynamically reweighted FeatureCollection.
+
+    Key outputs:
+      - Priority_Score = sum(score_i) where score_i = input_i × weight_i
+      - Priority_Score_Scaled = min-max scale Priority_Score to [0,1]
+      - Priority_Score_Composition = sum(score_i / sum(weights)) (weighted-average-like)
+
+      - Difference_Raw = current Priority_Score - previous Priority_Score
+      - Difference_Score = min-max normalize Difference_Raw to [-1,1] for map coloring
+
+    Keeps per-criterion diagnostic fields:
+      - <crit>_network_max_score
+      - <crit>_norm_score_network
+      - <crit>_norm_score_composition
+
+    Drops original source *_Score fields from output.
+    """
+    weights = session.get("weights", DEFAULT_WEIGHTS)
+    prev_weights = session.get("prev_weights", weights)  # first load => no difference
+
+    w_key = _weights_key(weights)
+    pw_key = _weights_key(prev_weights)
+    stat_sig = _stat_signature(BASE_GEOJSON_PATH)
+
+    # output is deterministic in (base file, weights, prev_weights):
+    # a matching If-None-Match skips both compute and transfer
+    etag = hashlib.md5(repr((stat_sig, w_key, pw_key)).encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        resp.headers["Vary"] = "Accept-Encoding"
+        return resp
+
+    accepts_gzip = "gzip" in request.headers.get("Accept-Encoding", "").lower()
+    if accepts_gzip:
+        body = _network_body_gzipped(w_key, pw_key, stat_sig)
+        resp = Response(body, mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(
+            _network_geojson_chunks(weights, prev_weights),
+            mimetype="application/json",
+            direct_passthrough=True,
+        )
+    resp.set_etag(etag)
+    resp.headers["Vary"] = "Accept-Encoding"
+    # no-cache (not no-store) so clients may keep a copy but must revalidate,
+    # letting the ETag produce 304s
+    resp.headers["Cache-Control"] = "private, no-cache"
     return resp
 
 